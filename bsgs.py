@@ -2,10 +2,11 @@
 # Module for babystep-giantstep ECDLP calculation.
 # Author: Vit Soucek
 
-from elliptic_curve import ECPointAtInfinity
+from elliptic_curve import ECPointAtInfinity, multi_scalar_multiplication
 from math import ceil, sqrt
+import secrets
 import time
-from helper_tools import BabyStepPoint, binary_search
+from helper_tools import BabyStepPoint, BabyStepTable, binary_search
 
 
 def generate_baby_steps(p, m):
@@ -21,7 +22,7 @@ def generate_baby_steps(p, m):
     b = ECPointAtInfinity(p.curve)
     baby_steps = [BabyStepPoint(b, 0)]
 
-    for i in range(1, m - 1):
+    for i in range(1, m):
         b = p + b
         baby_steps.append(BabyStepPoint(b, i))
 
@@ -31,19 +32,20 @@ def generate_baby_steps(p, m):
     return baby_steps
 
 
-def giant_steps(p, q, baby_steps, m):
+def giant_steps(p, q, baby_steps, m, max_steps=None):
     """
     Find collision of BS and calculated GS.
     :param p: ECPoint P
     :param q: ECPoint Q
     :param baby_steps: list of pre-generated baby steps
     :param m: number of babysteps
-    :return: Result of the algorithm - log_P Q
+    :param max_steps: number of giantsteps to give up after, unlimited if None
+    :return: Result of the algorithm - log_P Q, or None if not found
     """
     j = 0
     new_p = ECPointAtInfinity(p.curve)
 
-    while True:
+    while max_steps is None or j < max_steps:
         # x = q - j*p
         x = q - new_p
 
@@ -59,32 +61,276 @@ def giant_steps(p, q, baby_steps, m):
         # No collision found
         j += 1
 
+    return None
 
-def find_logarithm(q_list, p):
+
+def interleaved_steps(p, q, baby_steps, m, p2, max_steps=None):
     """
-    Find n such that n*P = Q for each Q
-    in the q_list
-    :param q_list: list of ECPoints Q
+    Pollard's interleaved BSGS: one babystep and one
+    giantstep are calculated alternately and each of them
+    is looked up among the steps of the other kind.
+    The babystep table is shared with other queries
+    and it grows only until it has m points.
+    :param p: ECPoint P
+    :param q: ECPoint Q
+    :param baby_steps: BabyStepTable of multiples of P
+    :param m: number of babysteps
+    :param p2: ECPoint m*P
+    :param max_steps: number of giantsteps to give up after, unlimited if None
+    :return: Result of the algorithm - log_P Q, or None if not found
+    """
+    giant_table = {}
+    x = q
+    j = 0
+
+    while max_steps is None or j < max_steps:
+        # New babystep against the giantsteps so far
+        if baby_steps.size <= j < m:
+            b, i = baby_steps.grow()
+            k = giant_table.get(b)
+            if k is not None:
+                return i + k * m
+
+        # x = q - j*m*p against all babysteps
+        i = baby_steps.get(x)
+        if i != -1:
+            return i + j * m
+
+        # Only the babysteps still to come need the giantsteps
+        if baby_steps.size < m:
+            giant_table.setdefault(x, j)
+        x = x - p2
+        j += 1
+
+    return None
+
+
+def grumpy_giants_steps(p, q, baby_steps, m, p2, order, max_steps=None):
+    """
+    Two grumpy giants and a baby (Bernstein, Lange):
+    babysteps i*P, giantsteps Q + j*m*P and 2Q - k*(m+1)*P
+    are calculated together until any two of them collide.
+    Collision of the baby and the second giant gives 2*log_P Q;
+    for even order of P, the half is only accepted
+    when it can be verified.
     :param p: ECPoint P
-    :return: list of logarithms for all Qs
+    :param q: ECPoint Q
+    :param baby_steps: BabyStepTable of multiples of P
+    :param m: step of the first giant
+    :param p2: ECPoint m*P
+    :param order: order of P
+    :param max_steps: number of steps to give up after, unlimited if None
+    :return: Result of the algorithm - log_P Q modulo order, or None if not found
+    """
+    def halve(s):
+        if order % 2 == 1:
+            return s * ((order + 1) // 2) % order
+        if s % 2 == 0 and (s // 2) * p == q:
+            return s // 2
+        return None
+
+    p3 = p2 + p
+    giant1_table = {}
+    giant2_table = {}
+    g1 = q
+    g2 = q + q
+    t = 0
+
+    while max_steps is None or t < max_steps:
+        if baby_steps.size <= t:
+            b, i = baby_steps.grow()
+            j = giant1_table.get(b)
+            if j is not None:
+                return (i - j * m) % order
+            k = giant2_table.get(b)
+            if k is not None:
+                result = halve(i + k * (m + 1))
+                if result is not None:
+                    return result
+
+        # g1 = q + t*m*p
+        i = baby_steps.get(g1)
+        if i != -1:
+            return (i - t * m) % order
+        k = giant2_table.get(g1)
+        if k is not None:
+            return t * m + k * (m + 1)
+        giant1_table.setdefault(g1, t)
+
+        # g2 = 2q - t*(m+1)*p
+        i = baby_steps.get(g2)
+        if i != -1:
+            result = halve(i + t * (m + 1))
+            if result is not None:
+                return result
+        j = giant1_table.get(g2)
+        if j is not None:
+            return j * m + t * (m + 1)
+        giant2_table.setdefault(g2, t)
+
+        g1 = g1 + p2
+        g2 = g2 - p3
+        t += 1
+
+    return None
+
+
+MODES = ('textbook', 'interleaved', 'grumpy')
+
+# Smaller batches are cheaper to verify point by point
+BATCH_VERIFICATION_MIN = 4
+
+
+def make_solver(p, mode='textbook', order=None, m=None):
+    """
+    Prepare the search for logarithms of points Q
+    to the base P. The babysteps are calculated once
+    (or grown lazily) and shared by all the searches.
+    Every search gives up after covering all logarithms
+    below the order, so Q outside of <P> gives None.
+    :param p: ECPoint P
+    :param mode: 'textbook', 'interleaved' or 'grumpy'
+    :param order: order of P, if known (otherwise approximated), required by 'grumpy' mode
+    :param m: number of babysteps for 'textbook' and 'interleaved' mode, sqrt of the order by default
+    :return: function returning log_P Q for an ECPoint Q, or None if Q is not a multiple of P
     """
-    r = p.order_approx()
-    m = ceil(sqrt(r))
+    r = order if order else p.order_approx()
+
+    if mode == 'textbook':
+        m = m or ceil(sqrt(r))
 
-    begin = time.time()
-    baby_steps = generate_baby_steps(p, m)
-    end = time.time()
+        begin = time.time()
+        baby_steps = generate_baby_steps(p, m)
+        end = time.time()
+
+        print(f'Babysteps generated and sorted in {(end - begin):.3f} seconds.\n')
+
+        p2 = m * p
+
+        steps = ceil(r / m) + 1
+
+        def search(q):
+            return giant_steps(p2, q, baby_steps, m, steps)
+    elif mode == 'interleaved':
+        m = m or ceil(sqrt(r))
+        baby_steps = BabyStepTable(p)
+        p2 = m * p
+
+        steps = ceil(r / m) + 1
+
+        def search(q):
+            return interleaved_steps(p, q, baby_steps, m, p2, steps)
+    elif mode == 'grumpy':
+        if not order:
+            raise ValueError('Mode grumpy needs the order of P!')
+        m = ceil(sqrt(r) / 2)
+        baby_steps = BabyStepTable(p)
+        p2 = m * p
+
+        # Baby and the first giant alone cover all i - j*m
+        steps = max(ceil(order / m), m) + 1
 
-    print(f'Babysteps generated and sorted in {(end - begin):.3f} seconds.\n')
+        def search(q):
+            return grumpy_giants_steps(p, q, baby_steps, m, p2, order, steps)
+    else:
+        raise ValueError(f'Unknown BSGS mode {mode}, expected one of {MODES}!')
 
+    if not order:
+        return search
+
+    def search_modulo(q):
+        if not isinstance(order * q, ECPointAtInfinity):
+            return None
+        result = search(q)
+        return None if result is None else result % order
+
+    return search_modulo
+
+
+def make_bounded_solver(p, lower, upper, m=None):
+    """
+    Prepare the search for logarithms known
+    to lie in the interval [lower, upper].
+    :param p: ECPoint P
+    :param lower: lower bound of log_P Q
+    :param upper: upper bound of log_P Q
+    :param m: number of babysteps, sqrt of the interval width by default
+    :return: function returning log_P Q for an ECPoint Q, or None if it is out of bounds
+    """
+    width = upper - lower + 1
+    if width < 1:
+        raise ValueError(f'Empty interval [{lower}, {upper}]!')
+
+    m = m or ceil(sqrt(width))
+    baby_steps = BabyStepTable(p)
+    while baby_steps.size < m:
+        baby_steps.grow()
     p2 = m * p
+    p_lower = lower * p
+    steps = ceil(width / m)
+
+    def search(q):
+        result = interleaved_steps(p, q - p_lower, baby_steps, m, p2, steps)
+        # The giantsteps may overshoot the interval
+        if result is None or lower + result > upper:
+            return None
+        return lower + result
+
+    return search
+
+
+def find_logarithm(q_list, p, mode='textbook', order=None):
+    """
+    Find n such that n*P = Q for each Q
+    in the q_list
+    :param q_list: list of ECPoints Q
+    :param p: ECPoint P
+    :param mode: 'textbook', 'interleaved' or 'grumpy'
+    :param order: order of P, if known (otherwise approximated), required by 'grumpy' mode
+    :return: list of logarithms for all Qs (None for Q which is not a multiple of P)
+    """
+    solve = make_solver(p, mode, order)
 
     res_list = []
 
     for i in q_list:
         begin = time.time()
-        res_list.append(giant_steps(p2, i, baby_steps, m))
+        res_list.append(solve(i))
         end = time.time()
         print(f'Logarithm of point {i} found in {(end - begin):.3f} seconds.\n')
 
     return res_list
+
+
+def verify_logarithms(q_list, p, results, security_bits=64, order=None):
+    """
+    Check n_i*P = Q_i for all results at once.
+    Random c_i are chosen and (-sum c_i*n_i)*P + sum c_i*Q_i
+    is computed by one multi-scalar multiplication,
+    it must be the point at infinity.
+    A wrong result passes only with negligible probability
+    (about 2^-bits for a group without small subgroups).
+    Small batches are checked point by point, which is cheaper.
+    :param q_list: list of ECPoints Q
+    :param p: ECPoint P
+    :param results: list of logarithms n
+    :param security_bits: bit length of the random coefficients,
+                          at most the bit length of the order
+    :param order: order of P, if known (otherwise approximated)
+    :return: True if all results are correct, False otherwise
+    """
+    if len(q_list) != len(results):
+        raise ValueError('Number of points and results must be the same!')
+
+    if len(q_list) < BATCH_VERIFICATION_MIN:
+        return all(r * p == q for q, r in zip(q_list, results))
+
+    bound = order if order else ceil(p.order_approx())
+    bits = min(security_bits, bound.bit_length())
+    coefficients = [secrets.randbits(bits) | 1 for _ in q_list]
+    n = sum(c * r for c, r in zip(coefficients, results))
+    if order:
+        n %= order
+
+    total = multi_scalar_multiplication([-n] + coefficients, [p] + q_list)
+    return isinstance(total, ECPointAtInfinity)
@@ -85,9 +85,10 @@ def main():
     for i in range(len(results)):
         print('================================================')
         print(f'lop_P Q{i + 1} = {results[i]}')
-        print(f'Result is correct: {results[i] * point_p == q_list[i]}')
 
     print('================================================')
+    print(f'Results are correct: {bsgs.verify_logarithms(q_list, point_p, results)}')
+    print('================================================')
 
 
 if __name__ == '__main__':
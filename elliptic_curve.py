@@ -46,6 +46,54 @@ class EllipticCurve:
             y = self.finite_field.get_element(y)
         return y ** 2 == x ** 3 + self.a * x + self.b
 
+    def lift_x(self, x, odd):
+        """
+        Find the point with coordinate x
+        and the given parity of y.
+        :param x: X coordinate
+        :param odd: True for odd y, False for even y
+        :return: ECPoint
+        """
+        if isinstance(x, int):
+            if not 0 <= x < self.finite_field.modulo:
+                raise ValueError(f'Coordinate {x} is out of the range of the finite field!')
+            x = self.finite_field.get_element(x)
+        y = (x ** 3 + self.a * x + self.b).sqrt()
+        if y.value == 0 and odd:
+            raise ValueError(f'There is no point with x = {x} and odd y!')
+        if y.value % 2 != odd:
+            y = -y
+        return ECPoint(x, y, self)
+
+    def decode_point(self, data):
+        """
+        Decode a point in the SEC1 format:
+        0x00 for the point at infinity,
+        0x02/0x03 + x for compressed point with even/odd y,
+        0x04 + x + y for uncompressed point.
+        :param data: bytes
+        :return: ECPoint
+        """
+        size = self.coordinate_size()
+        if data == b'\x00':
+            return ECPointAtInfinity(self)
+        if len(data) == 1 + size and data[0] in (2, 3):
+            return self.lift_x(int.from_bytes(data[1:], 'big'), data[0] == 3)
+        if len(data) == 1 + 2 * size and data[0] == 4:
+            x = int.from_bytes(data[1:1 + size], 'big')
+            y = int.from_bytes(data[1 + size:], 'big')
+            if max(x, y) >= self.finite_field.modulo:
+                raise ValueError(f'Coordinates of {data.hex()} are out of the range of the finite field!')
+            return ECPoint(x, y, self)
+        raise ValueError(f'Invalid SEC1 point encoding: {data.hex()}')
+
+    def coordinate_size(self):
+        """
+        Number of bytes of an encoded coordinate.
+        :return: int
+        """
+        return (self.finite_field.modulo.bit_length() + 7) // 8
+
     def __str__(self):
         return f'y^2 = x^3 + {self.a}x + {self.b}'
 
@@ -180,6 +228,26 @@ class ECPoint:
         """
         return (self.x, self.y, self.curve) == (other.x, other.y, other.curve)
 
+    def to_bytes(self, compressed=True):
+        """
+        Encode the point in the SEC1 format.
+        :param compressed: Encode only x and parity of y
+        :return: bytes
+        """
+        size = self.curve.coordinate_size()
+        x = self.x.value.to_bytes(size, 'big')
+        if compressed:
+            return bytes([2 + self.y.value % 2]) + x
+        return b'\x04' + x + self.y.value.to_bytes(size, 'big')
+
+    def __hash__(self):
+        """
+        Hash of the coordinates, so that points
+        can be used as dictionary keys.
+        :return: int
+        """
+        return hash((self.x.value, self.y.value))
+
     def order_approx(self):
         """
         The upper bound of the EC point order
@@ -249,3 +317,113 @@ class ECPointAtInfinity(ECPoint):
         :return: bool
         """
         return type(other) is ECPointAtInfinity
+
+    def __hash__(self):
+        """
+        All PaIs have the same hash
+        :return: int
+        """
+        return hash(inf)
+
+    def to_bytes(self, compressed=True):
+        """
+        PaI is encoded as a single zero byte
+        :param compressed: Ignored
+        :return: bytes
+        """
+        return b'\x00'
+
+
+def multi_scalar_multiplication(scalars, points):
+    """
+    Calculate sum of n_i*P_i at once.
+    Straus' interleaved windows are used for
+    a few points, Pippenger's buckets for many.
+    :param scalars: List of factors n_i
+    :param points: List of ECPoints P_i
+    :return: ECPoint
+    """
+    if len(scalars) != len(points):
+        raise ValueError('Number of scalars and points must be the same!')
+    if not points:
+        raise ValueError('Cannot multiply an empty list of points!')
+
+    curve = points[0].curve
+    pairs = []
+    for n, point in zip(scalars, points):
+        if not isinstance(n, int):
+            raise TypeError(f'Cannot multiply an ECPoint by {type(n)}!')
+        if n < 0:
+            n, point = -n, -point
+        if n != 0 and not isinstance(point, ECPointAtInfinity):
+            pairs.append((n, point))
+
+    if not pairs:
+        return ECPointAtInfinity(curve)
+
+    bits = max(n.bit_length() for n, _ in pairs)
+    if len(pairs) < 16:
+        return _straus(pairs, bits, 4, curve)
+    return _pippenger(pairs, bits, max(2, len(pairs).bit_length() - 3), curve)
+
+
+def _straus(pairs, bits, w, curve):
+    """
+    Straus' algorithm: one shared chain of doublings,
+    one table lookup per point and window.
+    :param pairs: List of (n, ECPoint) with n > 0
+    :param bits: Bit length of the largest n
+    :param w: Window width
+    :param curve: EllipticCurve of the points
+    :return: ECPoint
+    """
+    tables = []
+    for _, point in pairs:
+        table = [ECPointAtInfinity(curve), point]
+        for _ in range(2, 1 << w):
+            table.append(table[-1] + point)
+        tables.append(table)
+
+    mask = (1 << w) - 1
+    result = ECPointAtInfinity(curve)
+    for shift in range(((bits - 1) // w) * w, -1, -w):
+        for _ in range(w):
+            result = result + result
+        for (n, _), table in zip(pairs, tables):
+            digit = (n >> shift) & mask
+            if digit:
+                result = result + table[digit]
+    return result
+
+
+def _pippenger(pairs, bits, c, curve):
+    """
+    Pippenger's bucket method: every point is added
+    to one bucket per window, the buckets are then
+    summed with a running sum.
+    :param pairs: List of (n, ECPoint) with n > 0
+    :param bits: Bit length of the largest n
+    :param c: Window width
+    :param curve: EllipticCurve of the points
+    :return: ECPoint
+    """
+    mask = (1 << c) - 1
+    result = ECPointAtInfinity(curve)
+    for shift in range(((bits - 1) // c) * c, -1, -c):
+        for _ in range(c):
+            result = result + result
+
+        buckets = [ECPointAtInfinity(curve) for _ in range(mask)]
+        for n, point in pairs:
+            digit = (n >> shift) & mask
+            if digit:
+                buckets[digit - 1] = buckets[digit - 1] + point
+
+        # sum of d*B_d = B_max + (B_max + B_max-1) + ...
+        running = ECPointAtInfinity(curve)
+        window_sum = ECPointAtInfinity(curve)
+        for bucket in reversed(buckets):
+            running = running + bucket
+            window_sum = window_sum + running
+        result = result + window_sum
+    return result
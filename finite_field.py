@@ -132,6 +132,52 @@ class FiniteFieldElement:
             raise ValueError(f'Failed to invert {self.value}! GCD of {self.modulo} and {self.value} is {a}, not 1!')
         return FiniteFieldElement(prevy, self.modulo)
 
+    def sqrt(self):
+        """
+        Square root modulo prime p.
+        Shortcuts are used for p = 3 (mod 4)
+        and p = 5 (mod 8) (Atkin), Tonelli-Shanks otherwise.
+        :return: Element r such that r^2 = self
+        """
+        a, p = self.value, self.modulo
+        if a == 0 or p == 2:
+            return FiniteFieldElement(a, p)
+        if pow(a, (p - 1) // 2, p) != 1:
+            raise ValueError(f'{a} is not a quadratic residue modulo {p}!')
+
+        if p % 4 == 3:
+            return FiniteFieldElement(pow(a, (p + 1) // 4, p), p)
+
+        if p % 8 == 5:
+            v = pow(2 * a, (p - 5) // 8, p)
+            i = 2 * a * v * v % p
+            return FiniteFieldElement(a * v * (i - 1), p)
+
+        # Tonelli-Shanks: p - 1 = q * 2^s
+        q, s = p - 1, 0
+        while q % 2 == 0:
+            q //= 2
+            s += 1
+        z = 2
+        while pow(z, (p - 1) // 2, p) != p - 1:
+            z += 1
+
+        c = pow(z, q, p)
+        r = pow(a, (q + 1) // 2, p)
+        t = pow(a, q, p)
+        while t != 1:
+            # least i such that t^(2^i) = 1
+            i, t2 = 0, t
+            while t2 != 1:
+                t2 = t2 * t2 % p
+                i += 1
+            b = pow(c, 1 << (s - i - 1), p)
+            s = i
+            c = b * b % p
+            r = r * b % p
+            t = t * c % p
+        return FiniteFieldElement(r, p)
+
     def __truediv__(self, other):
         """
         Overloaded division operator.
@@ -199,7 +245,7 @@ class FiniteFieldElement:
         if isinstance(other, FiniteFieldElement):
             return self.value < other.value
         if other is inf:
-            return False
+            return True
         raise TypeError(f'Comparison between FFE and {type(other)}')
 
     def __gt__(self, other):
@@ -2,6 +2,11 @@
 # Module with other needed tools for ECDLP.
 # Author: Vit Soucek
 
+from elliptic_curve import ECPointAtInfinity
+from finite_field import FiniteFieldElement
+from itertools import islice
+from math import gcd
+
 
 class BabyStepPoint:
     """
@@ -38,3 +43,141 @@ def binary_search(element_list, element):
         else:
             return element_list[mid].index
     return -1
+
+
+class BabyStepTable:
+    """
+    Hash table of babysteps a*P, which
+    grows on demand and can be shared
+    by the searches for more points Q.
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.last = ECPointAtInfinity(p.curve)
+        self.points = {self.last: 0}
+        self.size = 1
+
+    def grow(self):
+        """
+        Calculate the next babystep.
+        :return: The new point and its index
+        """
+        self.last = self.last + self.p
+        index = self.size
+        self.points.setdefault(self.last, index)
+        self.size += 1
+        return self.last, index
+
+    def get(self, point):
+        """
+        Look up the index of a point.
+        :param point: ECPoint
+        :return: Index of the point, or -1 if it is not in the table.
+        """
+        return self.points.get(point, -1)
+
+
+def chunked(iterable, size):
+    """
+    Split an iterable into lists of given size
+    without reading it all into memory.
+    :param iterable: Any iterable
+    :param size: Size of the chunks
+    :return: Generator of lists
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def is_prime(n):
+    """
+    Deterministic Miller-Rabin test
+    (exact for n < 3.3 * 10^24).
+    :param n: Tested number
+    :return: Bool
+    """
+    if n < 2:
+        return False
+    bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    for b in bases:
+        if n % b == 0:
+            return n == b
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for b in bases:
+        x = pow(b, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def factorize(n):
+    """
+    Factorize n by trial division
+    and Pollard's rho.
+    :param n: Positive integer
+    :return: Dictionary {prime: exponent}
+    """
+    factors = {}
+    for d in (2, 3, 5, 7, 11, 13):
+        while n % d == 0:
+            factors[d] = factors.get(d, 0) + 1
+            n //= d
+
+    stack = [n] if n > 1 else []
+    while stack:
+        n = stack.pop()
+        if is_prime(n):
+            factors[n] = factors.get(n, 0) + 1
+            continue
+        d = _rho_divisor(n)
+        stack.extend((d, n // d))
+
+    return factors
+
+
+def _rho_divisor(n):
+    """
+    Find a non-trivial divisor of composite n.
+    :param n: Composite number
+    :return: Divisor of n
+    """
+    c = 1
+    while True:
+        x = y = 2
+        d = 1
+        while d == 1:
+            x = (x * x + c) % n
+            y = (y * y + c) % n
+            y = (y * y + c) % n
+            d = gcd(x - y, n)
+        if d != n:
+            return d
+        c += 1
+
+
+def crt(residues):
+    """
+    Chinese remainder theorem.
+    :param residues: List of pairs (x_i, n_i) with coprime n_i
+    :return: x modulo product of n_i such that x = x_i (mod n_i)
+    """
+    x, n = 0, 1
+    for x_i, n_i in residues:
+        # x + n*t = x_i (mod n_i)
+        t = (FiniteFieldElement(x_i - x, n_i) / n).value
+        x, n = x + n * t, n * n_i
+    return x % n
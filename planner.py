@@ -0,0 +1,221 @@
+# Module for choosing the fastest ECDLP algorithm for given queries.
+# Author: Vit Soucek
+
+from math import ceil, pi, sqrt
+from multiprocessing import Pool
+import time
+import bsgs
+import pohlig_hellman
+import rho
+from elliptic_curve import ECPointAtInfinity
+from helper_tools import factorize, is_prime
+
+# Approximate memory taken by one babystep in a BabyStepTable
+BYTES_PER_BABY_STEP = 400
+DEFAULT_MEMORY = 2 ** 30
+
+# Floyd's cycle detection takes 3 additions per iteration
+RHO_STEP_COST = 3
+
+
+class Plan:
+    """
+    One way to find the logarithms,
+    its estimated cost in group operations
+    and the parameters needed to run it.
+    """
+
+    def __init__(self, method, cost, reason, **params):
+        self.method = method
+        self.cost = cost
+        self.reason = reason
+        self.params = params
+
+    def __str__(self):
+        return f'{self.method}: {self.cost:,.0f} group operations ({self.reason})'
+
+
+def point_order(p, order):
+    """
+    Find the exact order of P from its multiple
+    (e.g. the order of the curve).
+    :param p: ECPoint P
+    :param order: multiple of the order of P
+    :return: order of P and its factorization {prime: exponent}
+    """
+    if not isinstance(order * p, ECPointAtInfinity):
+        raise ValueError(f'{order} is not a multiple of the order of {p}!')
+
+    factors = factorize(order)
+    for q in factors:
+        while factors[q] > 0 and isinstance((order // q) * p, ECPointAtInfinity):
+            order //= q
+            factors[q] -= 1
+
+    return order, {q: e for q, e in factors.items() if e > 0}
+
+
+def bsgs_cost(width, queries, entries):
+    """
+    Cost of BSGS with a table of babysteps calculated
+    beforehand and shared by all queries.
+    Babystep count balances the table against the giantsteps
+    (about width / 2m per query), capped by the memory.
+    :param width: number of possible logarithms
+    :param queries: number of queries
+    :param entries: number of table entries fitting in memory
+    :return: number of babysteps and the cost, or None if nothing fits
+    """
+    m = min(ceil(sqrt(queries * width / 2)), ceil(width), entries)
+    if m < 1:
+        return None
+    return m, m + queries * width / (2 * m)
+
+
+def rho_cost(order, mul_cost):
+    """
+    Expected cost of one Pollard's rho search.
+    :param order: prime order of the group
+    :param mul_cost: cost of one scalar multiplication
+    :return: cost
+    """
+    return RHO_STEP_COST * sqrt(pi * order / 2) + (2 * rho.PARTITIONS + 2) * mul_cost
+
+
+def plan(curve, p, q_list, bounds=None, cores=1, memory=DEFAULT_MEMORY, order=None):
+    """
+    Estimate the cost of every method applicable
+    to the queries and choose the cheapest one.
+    :param curve: EllipticCurve of the points
+    :param p: ECPoint P
+    :param q_list: list of ECPoints Q
+    :param bounds: pair (lower, upper) bounding all log_P Q, if known
+    :param cores: number of processes available
+    :param memory: memory budget in bytes
+    :param order: multiple of the order of P (e.g. order of the curve), if known
+    :return: chosen Plan
+    """
+    if p.curve != curve:
+        raise ValueError('Point P is not on the given curve!')
+
+    k = max(len(q_list), 1)
+    entries = memory // BYTES_PER_BABY_STEP
+    candidates = []
+
+    factors = None
+    if order:
+        n, factors = point_order(p, order)
+    else:
+        n = ceil(p.order_approx())
+    mul_cost = 1.5 * n.bit_length()
+
+    bsgs_plan = bsgs_cost(n, k, entries)
+    if bsgs_plan:
+        m, cost = bsgs_plan
+        size = 'order of P' if order else 'Hasse bound'
+        candidates.append(Plan('bsgs', cost, f'{m:,} babysteps for {size} {n:,}', m=m, width=n))
+
+    if bounds:
+        lower, upper = bounds
+        bounded_plan = bsgs_cost(upper - lower + 1, k, entries)
+        if bounded_plan:
+            m, cost = bounded_plan
+            candidates.append(Plan('bounded', cost + mul_cost, f'{m:,} babysteps for interval of width {upper - lower + 1:,}',
+                                   m=m, lower=lower, upper=upper))
+
+    if factors:
+        processes = min(cores, k)
+        if is_prime(n):
+            cost = k * rho_cost(n, mul_cost) / processes
+            candidates.append(Plan('rho', cost, f'prime order, constant memory, {processes} core(s)',
+                                   order=n, processes=processes))
+        else:
+            cost = 0
+            rho_primes = []
+            ms = {}
+            for q, e in factors.items():
+                sub_bsgs = bsgs_cost(q, k * e, entries // len(factors))
+                sub_rho = k * e * rho_cost(q, mul_cost)
+                if sub_bsgs and sub_bsgs[1] <= sub_rho:
+                    ms[q] = sub_bsgs[0]
+                    cost += sub_bsgs[1]
+                else:
+                    rho_primes.append(q)
+                    cost += sub_rho
+                # h = (n / q^(i+1)) * (Q - x*P) for each digit
+                cost += 2 * k * e * mul_cost
+            factorization = ' * '.join(f'{q}^{e}' if e > 1 else f'{q}' for q, e in sorted(factors.items()))
+            candidates.append(Plan('pohlig-hellman', cost, f'order of P = {factorization}, largest prime {max(factors):,}',
+                                   factors=factors, rho_primes=rho_primes, m=ms))
+
+    if not candidates:
+        raise ValueError(f'No method fits into {memory:,} bytes of memory!')
+
+    candidates.sort(key=lambda c: c.cost)
+    print('Estimated costs:')
+    for c in candidates:
+        print(f'  {c}')
+
+    best = candidates[0]
+    if len(candidates) > 1:
+        print(f'Chosen plan: {best.method}, {candidates[1].cost / best.cost:.1f}x cheaper than {candidates[1].method}.\n')
+    else:
+        print(f'Chosen plan: {best.method}, the only applicable method.\n')
+
+    return best
+
+
+def run(chosen, p, q_list):
+    """
+    Find the logarithms according to the plan.
+    :param chosen: Plan
+    :param p: ECPoint P
+    :param q_list: list of ECPoints Q
+    :return: list of logarithms for all Qs (None for Q out of bounds or not a multiple of P)
+    """
+    params = chosen.params
+
+    if chosen.method == 'rho':
+        if params['processes'] > 1:
+            with Pool(params['processes']) as pool:
+                return pool.starmap(rho.pollard_rho, [(p, q, params['order']) for q in q_list])
+        return [rho.pollard_rho(p, q, params['order']) for q in q_list]
+
+    if chosen.method == 'bsgs':
+        # All logarithms lie below the order (or the Hasse bound)
+        solve = bsgs.make_bounded_solver(p, 0, params['width'] - 1, params['m'])
+    elif chosen.method == 'bounded':
+        solve = bsgs.make_bounded_solver(p, params['lower'], params['upper'], params['m'])
+    elif chosen.method == 'pohlig-hellman':
+        solve = pohlig_hellman.make_solver(p, params['factors'], params['rho_primes'], params['m'])
+    else:
+        raise ValueError(f'Unknown method {chosen.method}!')
+
+    return [solve(q) for q in q_list]
+
+
+def find_logarithm(curve, p, q_list, bounds=None, cores=1, memory=DEFAULT_MEMORY, order=None):
+    """
+    Find n such that n*P = Q for each Q
+    in the q_list by the cheapest method.
+    :param curve: EllipticCurve of the points
+    :param p: ECPoint P
+    :param q_list: list of ECPoints Q
+    :param bounds: pair (lower, upper) bounding all log_P Q, if known
+    :param cores: number of processes available
+    :param memory: memory budget in bytes
+    :param order: multiple of the order of P (e.g. order of the curve), if known
+    :return: list of logarithms for all Qs
+    """
+    if not q_list:
+        return []
+
+    chosen = plan(curve, p, q_list, bounds, cores, memory, order)
+
+    begin = time.time()
+    results = run(chosen, p, q_list)
+    end = time.time()
+
+    print(f'{len(q_list):,} logarithms found by {chosen.method} in {(end - begin):.3f} seconds.\n')
+
+    return results
@@ -0,0 +1,52 @@
+# Module for Pohlig-Hellman ECDLP calculation.
+# Author: Vit Soucek
+
+import bsgs
+from elliptic_curve import ECPointAtInfinity
+from helper_tools import crt
+from rho import pollard_rho
+
+
+def make_solver(p, factors, rho_primes=(), m=None):
+    """
+    Prepare the search for logarithms of points Q
+    to the base P by reducing the problem to the
+    subgroups of prime order. Each of them is solved
+    by BSGS (with babysteps calculated beforehand
+    and shared by all queries) or by Pollard's rho.
+    :param p: ECPoint P
+    :param factors: factorization of the order of P, {prime: exponent}
+    :param rho_primes: primes whose subproblems are solved by Pollard's rho
+    :param m: dictionary {prime: number of babysteps} for the BSGS subproblems
+    :return: function returning log_P Q for an ECPoint Q, or None if Q is not a multiple of P
+    """
+    n = 1
+    for q, e in factors.items():
+        n *= q ** e
+
+    solvers = {}
+    for q in factors:
+        gamma = (n // q) * p
+        if q in rho_primes:
+            solvers[q] = lambda h, gamma=gamma, q=q: pollard_rho(gamma, h, q)
+        else:
+            solvers[q] = bsgs.make_bounded_solver(gamma, 0, q - 1, (m or {}).get(q))
+
+    def search(point_q):
+        if not isinstance(n * point_q, ECPointAtInfinity):
+            return None
+
+        residues = []
+        for q, e in factors.items():
+            # x = d_0 + d_1*q + ... + d_(e-1)*q^(e-1)
+            x = 0
+            for k in range(e):
+                h = (n // q ** (k + 1)) * (point_q - x * p)
+                d = solvers[q](h)
+                if d is None:
+                    return None
+                x += d * q ** k
+            residues.append((x, q ** e))
+        return crt(residues)
+
+    return search
@@ -0,0 +1,214 @@
+# Module for streaming bulk ECDLP queries from files.
+# Author: Vit Soucek
+
+import argparse
+import csv
+import json
+import time
+import bsgs
+from elliptic_curve import EllipticCurve, ECPoint
+from finite_field import FiniteField
+from helper_tools import chunked
+
+FORMATS = ('csv', 'jsonl', 'bin')
+
+
+def parse_point(value, curve):
+    """
+    Parse a point given either as a SEC1 hex string
+    or as a pair of coordinates (decimal or 0x hex).
+    :param value: String or pair of strings/ints
+    :param curve: EllipticCurve of the point
+    :return: ECPoint
+    """
+    if isinstance(value, str):
+        return curve.decode_point(bytes.fromhex(value))
+    x, y = (int(c, 0) if isinstance(c, str) else c for c in value)
+    return ECPoint(x, y, curve)
+
+
+def is_header(row):
+    """
+    Test whether a CSV row cannot be read as a point,
+    i.e. it is neither a pair of numbers nor a hex string.
+    :param row: List of strings
+    :return: Bool
+    """
+    try:
+        if len(row) == 1:
+            bytes.fromhex(row[0])
+        else:
+            for c in row[:2]:
+                int(c, 0)
+    except ValueError:
+        return True
+    return False
+
+
+def read_csv(f, curve):
+    """
+    Read points from CSV rows: either x,y
+    or a single SEC1 hex column. An optional
+    header in the first row is skipped.
+    :param f: Text file
+    :param curve: EllipticCurve of the points
+    :return: Generator of ECPoints
+    """
+    first = True
+    for row in csv.reader(f):
+        row = [c.strip() for c in row]
+        if not row or row[0].startswith('#'):
+            continue
+        if first:
+            first = False
+            if is_header(row):
+                continue
+        yield parse_point(row[0] if len(row) == 1 else row[:2], curve)
+
+
+def read_jsonl(f, curve):
+    """
+    Read points from JSON lines: {"x": .., "y": ..},
+    {"point": "<SEC1 hex>"} or a bare SEC1 hex string.
+    :param f: Text file
+    :param curve: EllipticCurve of the points
+    :return: Generator of ECPoints
+    """
+    for line in f:
+        if not line.strip():
+            continue
+        obj = json.loads(line)
+        if isinstance(obj, dict):
+            obj = obj['point'] if 'point' in obj else (obj['x'], obj['y'])
+        yield parse_point(obj, curve)
+
+
+def read_binary(f, curve):
+    """
+    Read concatenated SEC1 encoded points.
+    :param f: Binary file
+    :param curve: EllipticCurve of the points
+    :return: Generator of ECPoints
+    """
+    size = curve.coordinate_size()
+    lengths = {0: 0, 2: size, 3: size, 4: 2 * size}
+
+    while True:
+        prefix = f.read(1)
+        if not prefix:
+            return
+        if prefix[0] not in lengths:
+            raise ValueError(f'Invalid SEC1 prefix {prefix.hex()} at offset {f.tell() - 1}')
+        data = prefix + f.read(lengths[prefix[0]])
+        if len(data) != 1 + lengths[prefix[0]]:
+            raise ValueError('Truncated point at the end of the file!')
+        yield curve.decode_point(data)
+
+
+def guess_format(path):
+    """
+    Guess the file format from its extension.
+    :param path: File path
+    :return: One of FORMATS
+    """
+    if path.endswith('.jsonl') or path.endswith('.json'):
+        return 'jsonl'
+    if path.endswith('.bin'):
+        return 'bin'
+    return 'csv'
+
+
+def read_queries(path, curve, fmt=None):
+    """
+    Stream points Q from a file.
+    :param path: File path
+    :param curve: EllipticCurve of the points
+    :param fmt: 'csv', 'jsonl' or 'bin', guessed from the extension if None
+    :return: Generator of ECPoints
+    """
+    fmt = fmt or guess_format(path)
+    if fmt == 'bin':
+        with open(path, 'rb') as f:
+            yield from read_binary(f, curve)
+    elif fmt == 'jsonl':
+        with open(path, newline='') as f:
+            yield from read_jsonl(f, curve)
+    elif fmt == 'csv':
+        with open(path, newline='') as f:
+            yield from read_csv(f, curve)
+    else:
+        raise ValueError(f'Unknown format {fmt}, expected one of {FORMATS}!')
+
+
+def solve_stream(q_iter, p, out, fmt='csv', chunk_size=10000, mode='interleaved', order=None):
+    """
+    Find logarithms of a stream of points Q chunk by chunk
+    and write each chunk of results as soon as it is found.
+    The log of a point which is not a multiple of P is left empty.
+    :param q_iter: Iterable of ECPoints Q
+    :param p: ECPoint P
+    :param out: Text file for the results
+    :param fmt: Output format, 'csv' or 'jsonl'
+    :param chunk_size: Number of queries in one chunk
+    :param mode: BSGS mode, see bsgs.MODES
+    :param order: order of P, if known
+    :return: Number of solved queries
+    """
+    if fmt not in ('csv', 'jsonl'):
+        raise ValueError(f'Unknown output format {fmt}!')
+
+    solve = bsgs.make_solver(p, mode, order)
+    writer = csv.writer(out) if fmt == 'csv' else None
+    count = 0
+    unsolved = 0
+    begin = time.time()
+
+    for chunk in chunked(q_iter, chunk_size):
+        for q in chunk:
+            n = solve(q)
+            if n is None:
+                unsolved += 1
+            if writer:
+                writer.writerow([q.x, q.y, '' if n is None else n])
+            else:
+                out.write(json.dumps({'x': str(q.x), 'y': str(q.y), 'log': n}) + '\n')
+        out.flush()
+        count += len(chunk)
+        print(f'{count - unsolved:,} logarithms found, {unsolved:,} points not in <P>, '
+              f'{(time.time() - begin):.3f} seconds.')
+
+    return count - unsolved
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find log_P Q for every point Q in a file.')
+    parser.add_argument('input', help='CSV, JSONL or binary (SEC1) file with points Q')
+    parser.add_argument('output', help='CSV or JSONL file for the results')
+    parser.add_argument('--format', choices=FORMATS, help='input format (default: by extension)')
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--mode', choices=bsgs.MODES, default='interleaved')
+    parser.add_argument('--order', type=lambda s: int(s, 0), help='order of P, if known')
+    parser.add_argument('--prime', type=lambda s: int(s, 0), default=2 ** 42 + 1597)
+    parser.add_argument('--a', type=lambda s: int(s, 0), default=0)
+    parser.add_argument('--b', type=lambda s: int(s, 0), default=1)
+    parser.add_argument('--px', type=lambda s: int(s, 0), default=3)
+    parser.add_argument('--py', type=lambda s: int(s, 0), default=678235393584)
+    args = parser.parse_args()
+
+    output_format = guess_format(args.output)
+    if output_format not in ('csv', 'jsonl'):
+        parser.error(f'output must be a CSV or JSONL file, not {output_format}')
+    if args.mode == 'grumpy' and not args.order:
+        parser.error('mode grumpy needs --order')
+
+    ff = FiniteField(args.prime)
+    e = EllipticCurve(args.a, args.b, ff)
+    point_p = ECPoint(args.px, args.py, e)
+
+    with open(args.output, 'w', newline='') as out:
+        solve_stream(read_queries(args.input, e, args.format), point_p, out,
+                     output_format, args.chunk_size, args.mode, args.order)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# Module for Pollard's rho ECDLP calculation.
+# Author: Vit Soucek
+
+import random
+from elliptic_curve import ECPointAtInfinity
+from finite_field import FiniteFieldElement
+
+# Number of partitions of the r-adding walk (Teske)
+PARTITIONS = 20
+
+# Number of useless collisions after which Q is taken as not in <P>
+MAX_ATTEMPTS = 20
+
+# Smaller groups are searched one multiple of P after another,
+# the walks there often end in cycles with useless collisions only
+SMALL_ORDER = 100
+
+
+def pollard_rho(p, q, order):
+    """
+    Find n such that n*P = Q by Pollard's rho
+    with an r-adding walk and Floyd's cycle detection.
+    Needs only constant memory.
+    If Q is not a multiple of P (e.g. in a non-cyclic group),
+    every collision is useless (b1 = b2) and the search
+    gives up after MAX_ATTEMPTS of them.
+    :param p: ECPoint P
+    :param q: ECPoint Q
+    :param order: order of P, must be prime
+    :return: Result of the algorithm - log_P Q, or None if Q is not a multiple of P
+    """
+    if isinstance(q, ECPointAtInfinity):
+        return 0
+    if not isinstance(order * q, ECPointAtInfinity):
+        return None
+
+    if order < SMALL_ORDER:
+        x = ECPointAtInfinity(p.curve)
+        for n in range(order):
+            if x == q:
+                return n
+            x = x + p
+        return None
+
+    for _ in range(MAX_ATTEMPTS):
+        # Steps M_j = c_j*P + d_j*Q
+        coefficients = [(random.randrange(order), random.randrange(order)) for _ in range(PARTITIONS)]
+        steps = [c * p + d * q for c, d in coefficients]
+
+        def walk(x, a, b):
+            j = 0 if isinstance(x, ECPointAtInfinity) else x.x.value % PARTITIONS
+            c, d = coefficients[j]
+            return x + steps[j], (a + c) % order, (b + d) % order
+
+        # x = a*P + b*Q
+        a, b = random.randrange(order), random.randrange(order)
+        x = a * p + b * q
+        tortoise = hare = (x, a, b)
+
+        while True:
+            tortoise = walk(*tortoise)
+            hare = walk(*walk(*hare))
+            if tortoise[0] == hare[0]:
+                break
+
+        # a1*P + b1*Q = a2*P + b2*Q => log_P Q = (a2 - a1) / (b1 - b2)
+        _, a1, b1 = tortoise
+        _, a2, b2 = hare
+        if (b1 - b2) % order != 0:
+            return (FiniteFieldElement(a2 - a1, order) / (b1 - b2)).value
+
+    return None